@@ -1,6 +1,7 @@
 import os
-from bs4 import BeautifulSoup
-import json
+import re
+from lxml import etree
+import orjson
 
 print('hello py_gen_config!')
 
@@ -10,50 +11,131 @@ print(os.listdir("pages"))
 
 tools = []
 configs = {"tools": tools}
+
+# 预检 <meta name="show" content="true">(不区分大小写),只有 true 才展示,未命中的页面无需解析
+# 按 HTML 属性语法匹配:允许等号两侧空白、值不带引号;宁可多放行,不能漏掉应展示的页面
+_SHOW_RE = re.compile(
+    rb'name\s*=\s*["\']?show\b[^>]*content\s*=\s*["\']?true\b'
+    rb'|content\s*=\s*["\']?true\b[^>]*name\s*=\s*["\']?show\b',
+    re.IGNORECASE,
+)
 # print(configs)
 
+class _HeadCollector:
+  """lxml 解析器的 target,按回调收集第一个 title 和带 name 的 meta,head 结束后不再收集"""
+
+  def __init__(self):
+    self.reset(True)
+
+  def reset(self, stop_at_head):
+    self.stop_at_head = stop_at_head
+    self.done = False
+    self.found_title = False
+    self.in_title = False
+    self.title_parts = []
+    self.meta = {}
+
+  def start(self, tag, attrib):
+    if self.done:
+      return
+    if tag == "title":
+      # 与原先一致,只取第一个 title
+      if not self.found_title:
+        self.found_title = True
+        self.in_title = True
+    elif tag == "meta":
+      name = attrib.get("name")
+      if name:
+        # 与原先一致,同名 meta 只取第一个
+        self.meta.setdefault(name, attrib.get("content", ""))
+
+  def end(self, tag):
+    if self.done:
+      return
+    if tag == "title":
+      self.in_title = False
+    elif tag == "head" and self.stop_at_head:
+      self.done = True
+
+  def data(self, text):
+    if self.in_title and not self.done:
+      self.title_parts.append(text)
+
+  def close(self):
+    title = "".join(self.title_parts) if self.title_parts else None
+    return self.found_title, title, self.meta
+
+# 复用同一个 HTML 解析器,并跳过用不到的注释和空白文本节点;解析结果由 _HeadCollector 收集
+_COLLECTOR = _HeadCollector()
+_PARSER = etree.HTMLParser(
+  encoding="utf-8", remove_comments=True, remove_blank_text=True, target=_COLLECTOR
+)
+# 每次喂给解析器的字节数,head 结束后不再继续喂 body
+_FEED_SIZE = 8192
+
+def parse_head(data, stop_at_head=True):
+  """增量解析 HTML,收集 title 和带 name 的 meta
+
+  stop_at_head 为 True 时,解析器报告 </head> 结束后即停止,不再解析 body;为 False 时解析整个文档
+
+  返回 (found_title, title, meta);文档为空时抛出 etree.XMLSyntaxError
+  """
+  _COLLECTOR.reset(stop_at_head)
+  for start in range(0, len(data), _FEED_SIZE):
+    _PARSER.feed(data[start:start + _FEED_SIZE])
+    if _COLLECTOR.done:
+      break
+  return _PARSER.close()
+
 def gen_config():
   for root, dirs, files in os.walk("pages"):
+      # 预先拼好目录前缀,避免每个文件调用一次 os.path.join
+      root_sep = root + os.sep
       for file in files:
           if file.endswith(".html"):
-              file_path = os.path.join(root, file)
+              file_path = root_sep + file
               # print(file_path)
-              with open(file_path, "r", encoding="utf-8") as f:
-                  html_content = f.read()
-                  soup = BeautifulSoup(html_content, "html.parser")
+              with open(file_path, "rb") as f:
+                  data = f.read()
+                  # 正则预检不展示的页面直接跳过,省去 HTML 解析
+                  if not _SHOW_RE.search(data):
+                      continue
+                  # 直接用 lxml 流式解析字节,读完 <head> 即停止
+                  try:
+                      found_title, title, meta = parse_head(data)
+                      # libxml2 遇到 body 级元素会提前关闭 head,后面的 title/meta 读不到;
+                      # 预检已在原始字节中命中 show,head 内没找到时再完整解析一遍
+                      if "show" not in meta:
+                          found_title, title, meta = parse_head(data, stop_at_head=False)
+                  except etree.XMLSyntaxError:
+                      # 空文档视为不展示
+                      continue
                   # 获取标题,如果为空则展示文件名
-                  title = soup.title.string if soup.title else file.split(".")[0]
+                  title = title if found_title else file.split(".")[0]
 
                   # 判断是否展示，默认不展示
-                  show = soup.find("meta", attrs={"name": "show"})
-                  show = show["content"] if show else "false"
-                  if "false" == show:
+                  show = meta.get("show", "false")
+                  if show.lower() != "true":
                     continue
                 
-                  # 获取 keywords, 判断是否存在，不存在则返回空
-                  keywords = soup.find("meta", attrs={"name": "keywords"})
-                  keywords = keywords["content"] if keywords else ""
+                  # 获取 keywords, 不存在则返回空
+                  keywords = meta.get("keywords", "")
   
                   # 获取 description
-                  description = soup.find("meta", attrs={"name": "description"})
-                  description = description["content"] if description else ""
+                  description = meta.get("description", "")
   
                   # # 获取 favicon
                   # icon = soup.find("link", attrs={"rel": "icon"})["href"]
                   # print(icon)
   
                   # 获取 favicon
-                  icon = soup.find("meta", attrs={"name": "icon"})
-                  icon = icon["content"] if icon else ""
+                  icon = meta.get("icon", "")
   
                   # 获取功能 feture 并根据，转成字符串 list
-                  features = soup.find("meta", attrs={"name": "features"})
-                  features = features["content"] if features else ""
-                  features = features.split("，")
+                  features = meta.get("features", "").split("，")
 
                   # 获取排序
-                  rank = soup.find("meta", attrs={"name": "rank"})
-                  rank = int(rank["content"]) if rank else 0
+                  rank = int(meta.get("rank", "0") or 0)
   
                   config = {
                       "icon": icon,
@@ -69,10 +151,10 @@ def gen_config():
   return configs
 
 def save_config(configs):
-  json_data = json.dumps(configs, ensure_ascii=False, indent=4)
-  print(json_data)
-  with open("tools-config.json", "w", encoding="utf-8") as f:
-    json.dump(configs, f, ensure_ascii=False, indent=4)
+  # orjson 直接输出 UTF-8 字节,序列化速度远快于标准库 json
+  data = orjson.dumps(configs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+  with open("tools-config.json", "wb") as f:
+    f.write(data)
 
 if __name__ == "__main__":
   configs = gen_config()
@@ -1,104 +1,282 @@
+import hashlib
 import os
-from bs4 import BeautifulSoup
-import json
+import re
+from lxml import etree
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 
-print('hello py_gen_config!')
-
-# python os函数遍历同目录下的 pages 目录下的所有文件夹和文件，按照文件夹进行分类处理，解析其中的 html 文件内容
-print(os.getcwd())
-print(os.listdir("pages"))
+# 调试开关,开启后输出逐目录/逐文件的扫描日志
+DEBUG = False
 
 tools = []
 configs = {"tools": tools}
+
+# 解析结果缓存文件,按 (路径, mtime, size) 判断文件是否变化
+_CACHE_FILE = ".gen_cache.json"
+# 缓存版本取本脚本内容的哈希,提取逻辑一旦修改,旧缓存自动失效
+with open(__file__, "rb") as _f:
+    _CACHE_VERSION = hashlib.sha1(_f.read()).hexdigest()
+
+# 待解析文件少于该数量时顺序解析,进程池的启动开销反而更大
+_PARALLEL_MIN_FILES = 200
+# 进程池每次分发给子进程的文件数
+_CHUNKSIZE = 16
+
+# HTML 文件后缀
+_HTML = ".html"
+
+# 预检 <meta name="show" content="true">(不区分大小写),只有 true 才展示,未命中的页面无需解析
+# 按 HTML 属性语法匹配:允许等号两侧空白、值不带引号;宁可多放行,不能漏掉应展示的页面
+_SHOW_RE = re.compile(
+    rb'name\s*=\s*["\']?show\b[^>]*content\s*=\s*["\']?true\b'
+    rb'|content\s*=\s*["\']?true\b[^>]*name\s*=\s*["\']?show\b',
+    re.IGNORECASE,
+)
 # print(configs)
 
+
+@dataclass
+class ToolConfig:
+    """单个工具页面的配置,使用 __slots__ 代替每页一个 dict,orjson 可直接序列化"""
+    __slots__ = ("icon", "title", "keywords", "features", "description", "url", "rank")
+    icon: str
+    title: str
+    keywords: str
+    features: list
+    description: str
+    url: str
+    rank: int
+
+
+class _HeadCollector:
+    """lxml 解析器的 target,按回调收集第一个 title 和带 name 的 meta,head 结束后不再收集"""
+
+    def __init__(self):
+        self.reset(True)
+
+    def reset(self, stop_at_head):
+        self.stop_at_head = stop_at_head
+        self.done = False
+        self.found_title = False
+        self.in_title = False
+        self.title_parts = []
+        self.meta = {}
+
+    def start(self, tag, attrib):
+        if self.done:
+            return
+        if tag == "title":
+            # 与原先一致,只取第一个 title
+            if not self.found_title:
+                self.found_title = True
+                self.in_title = True
+        elif tag == "meta":
+            name = attrib.get("name")
+            if name:
+                # 与原先一致,同名 meta 只取第一个
+                self.meta.setdefault(name, attrib.get("content", ""))
+
+    def end(self, tag):
+        if self.done:
+            return
+        if tag == "title":
+            self.in_title = False
+        elif tag == "head" and self.stop_at_head:
+            self.done = True
+
+    def data(self, text):
+        if self.in_title and not self.done:
+            self.title_parts.append(text)
+
+    def close(self):
+        title = "".join(self.title_parts) if self.title_parts else None
+        return self.found_title, title, self.meta
+
+
+# 复用同一个 HTML 解析器,并跳过用不到的注释和空白文本节点;解析结果由 _HeadCollector 收集
+_COLLECTOR = _HeadCollector()
+_PARSER = etree.HTMLParser(
+    encoding="utf-8", remove_comments=True, remove_blank_text=True, target=_COLLECTOR
+)
+# 每次喂给解析器的字节数,head 结束后不再继续喂 body
+_FEED_SIZE = 8192
+
+
+def parse_head(data, stop_at_head=True):
+    """增量解析 HTML,收集 title 和带 name 的 meta
+
+    stop_at_head 为 True 时,解析器报告 </head> 结束后即停止,不再解析 body;为 False 时解析整个文档
+
+    返回 (found_title, title, meta);文档为空时抛出 etree.XMLSyntaxError
+    """
+    _COLLECTOR.reset(stop_at_head)
+    for start in range(0, len(data), _FEED_SIZE):
+        _PARSER.feed(data[start:start + _FEED_SIZE])
+        if _COLLECTOR.done:
+            break
+    return _PARSER.close()
+
+
 def get_html_files(directory):
     """递归获取目录下所有 HTML 文件路径"""
     html_files = []
-    # 获取目录的绝对路径
-    # abs_directory = os.path.abspath(directory)
-    
-    for root, dirs, files in os.walk(directory):
-        print(f"正在扫描目录: {root}")
-        print(f"  子目录: {dirs}")
-        print(f"  文件: {files}")
-        for file in files:
-            if file.endswith(".html"):
-                file_path = os.path.join(root, file)
-                html_files.append(file_path)
-                print(f"  ✓ 找到HTML: {file_path}")
+    # 用 os.scandir 手动遍历,DirEntry 自带类型信息,省去 os.walk 额外的 stat 调用
+    # 子目录逆序入栈,保证遍历顺序与 os.walk(topdown) 一致
+    stack = [directory]
+    while stack:
+        root = stack.pop()
+        if DEBUG:
+            print(f"正在扫描目录: {root}")
+        sub_dirs = []
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry.path)
+                elif entry.name.endswith(_HTML):
+                    html_files.append(entry.path)
+                    if DEBUG:
+                        print(f"  ✓ 找到HTML: {entry.path}")
+        stack.extend(reversed(sub_dirs))
     print(f"\n总共找到 {len(html_files)} 个HTML文件")
     return html_files
 
 
 def parse_html_config(file_path):
     """解析单个 HTML 文件,提取配置信息"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        html_content = f.read()
-        soup = BeautifulSoup(html_content, "html.parser")
+    with open(file_path, "rb") as f:
+        data = f.read()
+        # 正则预检不展示的页面直接跳过,省去 HTML 解析
+        if not _SHOW_RE.search(data):
+            return None
+        # 直接用 lxml 流式解析字节,读完 <head> 即停止
+        try:
+            found_title, title, meta = parse_head(data)
+            # libxml2 遇到 body 级元素会提前关闭 head,后面的 title/meta 读不到;
+            # 预检已在原始字节中命中 show,head 内没找到时再完整解析一遍
+            if "show" not in meta:
+                found_title, title, meta = parse_head(data, stop_at_head=False)
+        except etree.XMLSyntaxError:
+            # 空文档视为不展示
+            return None
         
         # 判断是否展示,默认不展示
-        show = soup.find("meta", attrs={"name": "show"})
-        show = show["content"] if show else "false"
-        if show == "false":
+        show = meta.get("show", "false")
+        if show.lower() != "true":
             return None
         
         # 获取标题,如果为空则展示文件名
         file_name = os.path.basename(file_path)
-        title = soup.title.string if soup.title else file_name.split(".")[0]
+        title = title if found_title else file_name.split(".")[0]
         
-        # 获取 keywords, 判断是否存在,不存在则返回空
-        keywords = soup.find("meta", attrs={"name": "keywords"})
-        keywords = keywords["content"] if keywords else ""
+        # 获取 keywords, 不存在则返回空
+        keywords = meta.get("keywords", "")
 
         # 获取 description
-        description = soup.find("meta", attrs={"name": "description"})
-        description = description["content"] if description else ""
+        description = meta.get("description", "")
 
         # 获取 favicon
-        icon = soup.find("meta", attrs={"name": "icon"})
-        icon = icon["content"] if icon else ""
+        icon = meta.get("icon", "")
 
         # 获取功能 features 并根据,转成字符串 list
-        features = soup.find("meta", attrs={"name": "features"})
-        features = features["content"] if features else ""
-        features = features.split("，")
+        features = meta.get("features", "").split("，")
 
         # 获取排序
-        rank = soup.find("meta", attrs={"name": "rank"})
-        rank = int(rank["content"]) if rank else 0
+        rank = int(meta.get("rank", "0") or 0)
+
+        return ToolConfig(
+            icon=icon,
+            title=title,
+            keywords=keywords,
+            features=features,
+            description=description,
+            url=file_path,
+            rank=rank,
+        )
+
+
+def _is_valid_cache_entry(entry):
+    """校验单条缓存的结构,config 为 None 或与 ToolConfig 字段一致的 dict"""
+    if not isinstance(entry, dict) or "config" not in entry:
+        return False
+    if not isinstance(entry.get("mtime"), int) or not isinstance(entry.get("size"), int):
+        return False
+    config = entry["config"]
+    return config is None or (isinstance(config, dict) and config.keys() == set(ToolConfig.__slots__))
 
-        config = {
-            "icon": icon,
-            "title": title,
-            "keywords": keywords,
-            "features": features,
-            "description": description,
-            "url": file_path,
-            "rank": rank
-        }
-        return config
+
+def load_cache():
+    """读取解析缓存,文件不存在、损坏、结构不对或版本不一致时返回空缓存"""
+    try:
+        with open(_CACHE_FILE, "rb") as f:
+            cache = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != _CACHE_VERSION:
+        return {}
+    files = cache.get("files")
+    if not isinstance(files, dict):
+        return {}
+    return {path: entry for path, entry in files.items() if _is_valid_cache_entry(entry)}
+
+
+def save_cache(cache):
+    """写回解析缓存"""
+    with open(_CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps({"version": _CACHE_VERSION, "files": cache}))
 
 
 def gen_config():
     """生成配置文件"""
     # 1. 获取所有 HTML 文件路径
     html_files = get_html_files("pages")
-    
-    # 2. 处理每个 HTML 文件
+
+    # 2. 对比缓存,只有 mtime 或 size 变化的文件才需要重新解析
+    cache = load_cache()
+    new_cache = {}
+    stale_files = []
     for file_path in html_files:
-        config = parse_html_config(file_path)
+        st = os.stat(file_path)
+        entry = cache.get(file_path)
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            new_cache[file_path] = entry
+        else:
+            new_cache[file_path] = {"mtime": st.st_mtime_ns, "size": st.st_size}
+            stale_files.append(file_path)
+
+    # 3. 解析变化的 HTML 文件,文件较多时才启用多进程,map 保持原有顺序
+    if len(stale_files) < _PARALLEL_MIN_FILES:
+        results = list(map(parse_html_config, stale_files))
+    else:
+        max_workers = min(os.cpu_count() or 1, len(stale_files) // _CHUNKSIZE + 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(parse_html_config, stale_files, chunksize=_CHUNKSIZE))
+    for file_path, config in zip(stale_files, results):
+        new_cache[file_path]["config"] = config
+    print(f"重新解析 {len(stale_files)} 个文件,命中缓存 {len(html_files) - len(stale_files)} 个")
+
+    # 4. 按文件顺序汇总配置
+    for file_path in html_files:
+        config = new_cache[file_path]["config"]
+        if isinstance(config, dict):  # 缓存中读出的是 dict
+            config = ToolConfig(**config)
         if config:  # 只添加需要展示的配置
             tools.append(config)
-    
+
+    save_cache(new_cache)
     return configs
 
 def save_config(configs):
-  json_data = json.dumps(configs, ensure_ascii=False, indent=4)
-  print(json_data)
-  with open("tools-config.json", "w", encoding="utf-8") as f:
-    json.dump(configs, f, ensure_ascii=False, indent=4)
+  # orjson 直接输出 UTF-8 字节,序列化速度远快于标准库 json
+  data = orjson.dumps(configs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+  with open("tools-config.json", "wb") as f:
+    f.write(data)
 
 if __name__ == "__main__":
+  # 放在入口下,避免 spawn/forkserver 方式启动的子进程重新导入模块时重复输出
+  print('hello py_gen_config!')
+  # python os函数遍历同目录下的 pages 目录下的所有文件夹和文件，按照文件夹进行分类处理，解析其中的 html 文件内容
+  print(os.getcwd())
+  print(os.listdir("pages"))
   configs = gen_config()
   save_config(configs)
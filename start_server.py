@@ -5,12 +5,17 @@
 """
 
 import http.server
-import socketserver
 import webbrowser
 import os
 import sys
 from pathlib import Path
 
+
+class KeepAliveHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """使用 HTTP/1.1 保持连接复用,避免每个静态资源都重新建立 TCP 连接"""
+    protocol_version = "HTTP/1.1"
+
+
 def start_server():
     # 确保在正确的目录
     script_dir = Path(__file__).parent
@@ -31,9 +36,9 @@ def start_server():
     # 设置端口
     PORT = 8001
 
-    # 检查端口是否被占用
+    # 检查端口是否被占用; 使用多线程服务器并发处理页面的多个资源请求
     try:
-        with socketserver.TCPServer(("", PORT), http.server.SimpleHTTPRequestHandler) as httpd:
+        with http.server.ThreadingHTTPServer(("", PORT), KeepAliveHTTPRequestHandler) as httpd:
             print(f"🚀 启动HTTP服务器...")
             print(f"📂 服务目录: {script_dir}")
             print(f"🌐 访问地址: http://localhost:{PORT}/{HTML_PATH}")